@@ -0,0 +1,48 @@
+"""Builds the indexes and full-text search table main.py relies on into mcd_outlets.db.
+
+The app only opens the database read-only, so run this whenever mcd_outlets.db
+changes and commit the result:
+
+    python build_db.py
+"""
+import sqlite3
+
+
+def build_db(path: str = "mcd_outlets.db") -> None:
+    """Creates the indexes and the trigram FTS table, then refreshes the planner statistics."""
+    conn = sqlite3.connect(path)
+    try:
+        # Everything runs in one transaction, so a failed run leaves the database untouched
+        conn.executescript("""
+            BEGIN;
+
+            -- Trigram full-text index over name/address for contains-style (LIKE '%x%') searches,
+            -- kept in sync with the outlets table by triggers
+            CREATE VIRTUAL TABLE IF NOT EXISTS outlets_fts USING fts5(
+                name, address, content='outlets', content_rowid='id', tokenize='trigram'
+            );
+            CREATE TRIGGER IF NOT EXISTS outlets_fts_ai AFTER INSERT ON outlets BEGIN
+                INSERT INTO outlets_fts(rowid, name, address) VALUES (new.id, new.name, new.address);
+            END;
+            CREATE TRIGGER IF NOT EXISTS outlets_fts_ad AFTER DELETE ON outlets BEGIN
+                INSERT INTO outlets_fts(outlets_fts, rowid, name, address) VALUES ('delete', old.id, old.name, old.address);
+            END;
+            CREATE TRIGGER IF NOT EXISTS outlets_fts_au AFTER UPDATE ON outlets BEGIN
+                INSERT INTO outlets_fts(outlets_fts, rowid, name, address) VALUES ('delete', old.id, old.name, old.address);
+                INSERT INTO outlets_fts(rowid, name, address) VALUES (new.id, new.name, new.address);
+            END;
+            -- Re-index from the outlets table, in case it was edited without the triggers
+            INSERT INTO outlets_fts(outlets_fts) VALUES ('rebuild');
+
+            CREATE INDEX IF NOT EXISTS idx_categories_outlet ON categories(outlet_id);
+            CREATE INDEX IF NOT EXISTS idx_categories_cat_nc ON categories(category COLLATE NOCASE);
+            CREATE INDEX IF NOT EXISTS idx_outlets_lat_lng ON outlets(lat, lng);
+            ANALYZE;
+
+            COMMIT;
+        """)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    build_db()
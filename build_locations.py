@@ -0,0 +1,48 @@
+"""Regenerates locations_data.py from the outlets database.
+
+Run this whenever mcd_outlets.db changes:
+
+    python build_locations.py
+"""
+import re
+import sqlite3
+
+# Define common street-type prefixes to remove
+STREET_PREFIXES = frozenset(["jalan", "jl", "st", "street", "persiaran", "lorong", "lebuhraya", "avenue", "ave"])
+
+# Matches 5-digit postal codes
+POSTAL_CODE_RE = re.compile(r"\b\d{5}\b")
+
+def get_cleaned_locations():
+    """Extracts cleaned locations (without street-type words) from database."""
+    with sqlite3.connect("mcd_outlets.db") as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT DISTINCT address FROM outlets")
+        addresses = [row[0] for row in cursor.fetchall()]
+
+    locations = set()
+
+    for address in addresses:
+        # Remove postal codes and lowercase the whole address once
+        address = POSTAL_CODE_RE.sub("", address).lower()
+
+        # Split address components
+        for part in address.split(","):
+            # Remove street-type words if present (split() also drops surrounding spaces)
+            cleaned_part = " ".join(word for word in part.split() if word not in STREET_PREFIXES)
+
+            if cleaned_part:
+                locations.add(cleaned_part.title())  # Capitalize words for consistency
+
+    return sorted(locations)
+
+
+if __name__ == "__main__":
+    # Write the cleaned locations out as a Python literal so the chatbot can import
+    # them without touching the database at startup
+    with open("locations_data.py", "w", encoding="utf-8") as f:
+        f.write("# Generated by build_locations.py from mcd_outlets.db. Do not edit by hand.\n")
+        f.write("LOCATIONS = (\n")
+        for location in get_cleaned_locations():
+            f.write(f"    {location!r},\n")
+        f.write(")\n")
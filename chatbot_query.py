@@ -1,10 +1,7 @@
-import re
-from fuzzywuzzy import fuzz, process
-import spacy
-import sqlite3
-from spacy.lang.en.stop_words import STOP_WORDS
-
-nlp = spacy.load("en_core_web_sm")
+from functools import lru_cache
+from rapidfuzz import fuzz, process, utils
+import ahocorasick
+from locations_data import LOCATIONS
 
 # Define known outlet categories
 OUTLET_CATEGORIES = {
@@ -22,63 +19,138 @@ OUTLET_CATEGORIES = {
     "Electric Vehicle": ["electric vehicle", "ev charging", "charging station"],
 }
 
-# Define common street-type prefixes to remove
-STREET_PREFIXES = ["jalan", "jl", "st", "street", "persiaran", "lorong", "lebuhraya", "avenue", "ave"]
+# Flatten category keywords once so they can be scored in a single batch
+KEYWORDS = [keyword for keywords in OUTLET_CATEGORIES.values() for keyword in keywords]
+KEYWORD_TO_CAT = [category for category, keywords in OUTLET_CATEGORIES.items() for _ in keywords]
+
+# Aho-Corasick automaton over all keywords, for finding exact keyword hits in one scan of the query
+KEYWORD_AUTOMATON = ahocorasick.Automaton()
+for keyword, category in zip(KEYWORDS, KEYWORD_TO_CAT):
+    KEYWORD_AUTOMATON.add_word(keyword, category)
+KEYWORD_AUTOMATON.make_automaton()
+
+# English stop words (same list as spaCy's English model), built once at import
+_CONTRACTIONS = ["n't", "'d", "'ll", "'m", "'re", "'s", "'ve"]
+STOP_WORDS = frozenset(
+    """
+a about above across after afterwards again against all almost alone along
+already also although always am among amongst amount an and another any anyhow
+anyone anything anyway anywhere are around as at
+
+back be became because become becomes becoming been before beforehand behind
+being below beside besides between beyond both bottom but by
+
+call can cannot ca could
+
+did do does doing done down due during
+
+each eight either eleven else elsewhere empty enough even ever every
+everyone everything everywhere except
+
+few fifteen fifty first five for former formerly forty four from front full
+further
+
+get give go
+
+had has have he hence her here hereafter hereby herein hereupon hers herself
+him himself his how however hundred
+
+i if in indeed into is it its itself
+
+keep
 
-def get_cleaned_locations():
-    """Extracts cleaned locations (without street-type words) from database."""
-    with sqlite3.connect("mcd_outlets.db") as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT DISTINCT address FROM outlets")
-        addresses = [row[0] for row in cursor.fetchall()]
+last latter latterly least less
 
-    locations = set()
-    
-    for address in addresses:
-        # Remove postal codes
-        address = re.sub(r"\b\d{5}\b", "", address)
+just
 
-        # Split address components
-        parts = [part.strip() for part in address.split(",")]
+made make many may me meanwhile might mine more moreover most mostly move much
+must my myself
 
-        for part in parts:
-            words = part.lower().split()
-            
-            # Remove street-type words if present
-            filtered_words = [word for word in words if word not in STREET_PREFIXES]
-            cleaned_part = " ".join(filtered_words).strip()
-            
-            if cleaned_part:  
-                locations.add(cleaned_part.title())  # Capitalize words for consistency
+name namely neither never nevertheless next nine no nobody none noone nor not
+nothing now nowhere
 
-    return list(locations)
+of off often on once one only onto or other others otherwise our ours ourselves
+out over own
 
-# Get cleaned locations from DB
-locations = get_cleaned_locations()
+part per perhaps please put
 
+quite
+
+rather re really regarding
+
+same say see seem seemed seeming seems serious several she should show side
+since six sixty so some somehow someone something sometime sometimes somewhere
+still such
+
+take ten than that the their them themselves then thence there thereafter
+thereby therefore therein thereupon these they third this those though three
+through throughout thru thus to together too top toward towards twelve twenty
+two
+
+under until up unless upon us used using
+
+various very very via was we well were what whatever when whence whenever where
+whereafter whereas whereby wherein whereupon wherever whether which while
+whither who whoever whole whom whose why will with within without would
+
+yet you your yours yourself yourselves
+""".split()
+    + _CONTRACTIONS
+    + [word.replace("'", apostrophe) for apostrophe in ["‘", "’"] for word in _CONTRACTIONS]
+)
+
+# LOCATIONS holds the title-cased cleaned locations, generated from the database ahead of time
+# by build_locations.py. This parallel corpus is normalized once (lowercased, punctuation removed)
+# so matching can skip per-choice processing
+LOCATIONS_NORM = [utils.default_process(location) for location in LOCATIONS]
+
+# Exact lookup from normalized location words to the display form, so correctly spelled
+# locations are found without running the fuzzy matcher
+LOCATIONS_EXACT = {}
+for display, normalized in sorted(zip(LOCATIONS, LOCATIONS_NORM)):
+    LOCATIONS_EXACT.setdefault(" ".join(normalized.split()), display)
+MAX_LOCATION_WORDS = max((len(key.split()) for key in LOCATIONS_EXACT), default=0)
+
+@lru_cache(maxsize=4096)
 def extract_location(query: str):
-    """Extracts a potential location from the query using fuzzy matching."""
+    """Extracts a potential location from the (lowercased) query using exact, then fuzzy, matching."""
+
+    # Normalize the query the same way as the corpus
+    query = utils.default_process(query)
+
+    # Look up the query's word n-grams (longest first) among the known locations
+    words = query.split()
+    for n in range(min(MAX_LOCATION_WORDS, len(words)), 0, -1):
+        for i in range(len(words) - n + 1):
+            match = LOCATIONS_EXACT.get(" ".join(words[i:i + n]))
+            if match:
+                return match
 
-    # Perform fuzzy matching with known locations
-    match, score = process.extractOne(query.title(), locations)
-    return match if score > 80 else None
+    # Perform fuzzy matching with known locations (None if nothing scores above the threshold)
+    result = process.extractOne(query, LOCATIONS_NORM, scorer=fuzz.WRatio,
+                                processor=None, score_cutoff=80)
+    return LOCATIONS[result[2]] if result else None
 
+@lru_cache(maxsize=4096)
 def extract_category(query: str):
-    """Extracts categories based on fuzzy matching of keywords."""
+    """Extracts categories based on exact, then fuzzy, matching of keywords."""
 
-    categories = set()  # Initialize an empty set to store categories
+    # Keywords that appear verbatim in the query need no fuzzy matching
+    categories = {category for _, category in KEYWORD_AUTOMATON.iter(query)}
 
-    for category, keywords in OUTLET_CATEGORIES.items():
-        for keyword in keywords:
-            # Perform fuzzy matching with the cleaned query
-            if fuzz.partial_ratio(query, keyword) > 80:  # Adjust threshold as needed
-                categories.add(category)
+    # Fuzzy-score the query, in one call, only against keywords of categories not matched yet
+    # (scores below the cutoff are 0)
+    remaining = [i for i, category in enumerate(KEYWORD_TO_CAT) if category not in categories]
+    if remaining:
+        scores = process.cdist([query], [KEYWORDS[i] for i in remaining],
+                               scorer=fuzz.partial_ratio, score_cutoff=80)[0]  # Adjust threshold as needed
+        categories.update(KEYWORD_TO_CAT[i] for i, score in zip(remaining, scores) if score >= 80)
 
-    return categories  # Return the set of matched categories
+    # Return an immutable set so the cached result can't be mutated by callers
+    return frozenset(categories)
 
 
+@lru_cache(maxsize=4096)
 def preprocess_query(query: str) -> str:
     """Preprocesses the query by removing stop words and normalizing it."""
-    stop_words = STOP_WORDS  # SpaCy's predefined stop words
-    query_cleaned = " ".join([word for word in query.lower().split() if word not in stop_words])
-    return query_cleaned.strip()
\ No newline at end of file
+    return " ".join(word for word in query.lower().split() if word not in STOP_WORDS)
\ No newline at end of file
@@ -0,0 +1,185 @@
+# Generated by build_locations.py from mcd_outlets.db. Do not edit by hand.
+LOCATIONS = (
+    '& 16',
+    '1 Jln 3/109E',
+    '1 Sentral',
+    '1-3',
+    '1/116B',
+    '1/76D',
+    '120-120A Bukit Bintang',
+    '1200 Kuala Lumpur',
+    '15',
+    '2/125',
+    '2/21D',
+    '225',
+    '295',
+    '2A & B',
+    '348',
+    '37/56',
+    '38',
+    '452',
+    '48',
+    '5241 & 5242',
+    '5Th Mile',
+    '8/27A',
+    '8Km',
+    '93A',
+    'Alpha Angle Complex',
+    'Ampang',
+    'Bandar Baru Sri Petaling',
+    'Bandar Sri Damansara',
+    'Bandaraya Kuala Lumpur Kuala Lumpur',
+    'Bangsar',
+    'Bangsar Baru',
+    "Bangunan Restoran Mcdonald'S",
+    'Batu 5 1/4',
+    'Batu 6 1/2',
+    'Block D',
+    'Bukit Bintang',
+    'Bukit Kiara',
+    'Busana',
+    'Cendikiawan',
+    'Cheras',
+    'Cohcrane',
+    'Concourse Floor',
+    'Desa Business Park',
+    'Desa Pandan',
+    'Desapark City',
+    'Federal Territory Of Kuala Lumpur',
+    'First Floor',
+    'Fletcher',
+    'G17A & G17B',
+    'Genting Kelang',
+    'Giant Ulu Kelang',
+    'Gombak',
+    'Ground & Mezzanine Floor',
+    'Ground Floor',
+    'Hsd 111856',
+    'Imbi',
+    'Intermark Mall',
+    'Kampung Segambut Tengah',
+    'Kepong',
+    'Kepong Lebuh Raya',
+    'Kl-Seremban Highway',
+    'Km5.5',
+    'Kompleks Idaman',
+    'Kuala Lumpur',
+    'Kuala Lumpur Sentral Station',
+    'Kuala Lumpur.',
+    'Kuchai Entrepreneurs Park',
+    'Kuching',
+    'Langkawi',
+    'Lebuh Raya Lingkaran Tengah 2',
+    'Lebuh Raya Selayang',
+    'Leisure Mall',
+    'Level 4',
+    'Level1',
+    'Lg',
+    'Lg 16',
+    'Lingkaran Syed Putra',
+    'Lingkaran Tengah 2 (Mrr 2)',
+    'Lingkaran Tengah Ii',
+    'Lot',
+    'Lot &',
+    'Lot & Changkat Permata',
+    'Lot 05-93',
+    'Lot 1',
+    'Lot 14',
+    'Lot 2 & 2-1',
+    'Lot 3644 Hs (D) &',
+    'Lot 8',
+    'Lot C35 - 38',
+    'Lot G-13',
+    'Lot G-W-1',
+    'Lot Gf32 & Ff31',
+    'Lot No G-08',
+    'Lot No. 62',
+    'Lot No. B1-03 & B1-E-03',
+    'Lot No. G17',
+    'Lot Pt',
+    'Lot Pt 1',
+    'Lot Pt 2536',
+    'Lot Pt 7430',
+    'Lot Pt 8081 Hs (D) 107241',
+    'Lot Pt 8669',
+    'Lot Pt21552 & Pt21553',
+    'Lower Ground Floor',
+    'M01 & M02',
+    'Malaysia',
+    'Malaysia.',
+    'Medan Idaman',
+    'Menara Mara',
+    'Mewah Utara',
+    'Mid Valley Megamall',
+    'Mukim Ampang',
+    'Mukim Batu',
+    'Mukim Petaling',
+    'Mukim Setapak',
+    'Mukim Setapak Dalam',
+    'Mukim Sungai Buloh',
+    'Mytown Shopping Centre',
+    'No 63 & 63-1',
+    'No 9',
+    'No. 1',
+    'No. 2',
+    'No. 232',
+    'No. 40 - 50',
+    'No. 6',
+    'Off Kuchai Lama',
+    'Old Klang Road',
+    'P Ramlee',
+    'Pahang',
+    'Pantai Sentral',
+    'Pantai Sentral 1',
+    'Part Of Lot 201138',
+    'Pearl Point Shopping Complex',
+    'Peel',
+    'Perdana',
+    'Perusahaan Pkns',
+    'Petronas Petrol Station',
+    'Plaza Mont Kiara',
+    'Pt 8938',
+    'Pusat Bandar Wangsa Maju',
+    'Pusat Perdagangan Salak Ii',
+    'R1',
+    'Radin Tengah',
+    'Raja Chulan',
+    'Residen',
+    'Rohas Pure Circle',
+    'Section 85',
+    'Section 90',
+    'Segambut',
+    'Seksyen 57',
+    'Sentul',
+    'Sentul Pasar',
+    'Sentul/Batu Caves',
+    'Seremban Kl-Highway',
+    'Seri Kembangan',
+    'Setapak',
+    'Sg03 & Sg04',
+    'Sunway Velocity Mall',
+    'Suria Klcc Shopping Centre',
+    'Taman Danau Kota',
+    'Taman Desa',
+    'Taman Desa Petaling',
+    'Taman Melati',
+    'Taman Segar',
+    'Taman Setiawangsa',
+    'Taman Tun Dr Ismail',
+    'Technology Park Malaysia',
+    'Telawi Lima',
+    'Tingkat 3',
+    'Travers',
+    'Tuanku Abdul Rahman',
+    'Tun Mohd Fuad 2',
+    'Tun Perak',
+    'Tun Razak',
+    'Unit No. L4. 02 & 03',
+    'Wangsa Maju',
+    'Waterfront Parkcity',
+    'West Wing',
+    'Wilayah Persekutuan Kuala Lumpur.',
+    'Wisma Lim Foo Yong',
+    'Wisma Teck Lee',
+    'Wlayah Persekutuan Kuala Lumpur',
+)
@@ -1,22 +1,26 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
+from anyio import to_thread
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from chatbot_query import extract_category, extract_location, preprocess_query
-import spacy
 import sqlite3
+import json
+import math
 import os
+import threading
+import orjson
 
 development = os.getenv("DEVELOPMENT", "False").lower() == "true"  # Check if in development mode
 
 # Initialize FastAPI application with custom documentation URLs based on environment
+# Responses are serialized with orjson instead of the stdlib json module
 app = FastAPI(
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if development else None,
     redoc_url="/redoc" if development else None,
     openapi_url="/openapi.json" if development else None
 )
 
-# Load spaCy NLP model (small English model for efficiency)
-nlp = spacy.load("en_core_web_sm")
-
 # Read allowed origin from .env
 allowed_origin = os.getenv("ALLOWED_ORIGIN", "*")  # Default to "*" if not set
 
@@ -33,115 +37,213 @@ app.add_middleware(
 db_dir = "mcd_outlets.db"
 
 
+# Open a read-only connection to the SQLite database with per-connection performance settings applied
+# The indexes and FTS table the routes rely on are built offline by build_db.py
+def connect_db() -> sqlite3.Connection:
+  conn = sqlite3.connect(f"file:{db_dir}?mode=ro", uri=True)
+  conn.execute("PRAGMA mmap_size=268435456")  # Memory-map up to 256 MB of the database file
+  conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+  return conn
+
+
+# One long-lived connection per worker thread, reused across requests
+_local = threading.local()
+
+
+# Return the calling thread's SQLite connection, opening it on first use
+def get_db() -> sqlite3.Connection:
+  conn = getattr(_local, "conn", None)
+  if conn is None:
+    _local.conn = conn = connect_db()
+  return conn
+
+
+# Execute a query on the given connection and return the rows as dictionaries
+# Rows come back as plain tuples and are zipped with the column names once,
+# instead of allocating a sqlite3.Row per row and then copying it into a dict
+def fetch_rows(conn: sqlite3.Connection, query: str, params=()) -> list:
+  cursor = conn.execute(query, params)
+  columns = [column[0] for column in cursor.description]
+  return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+# Run a DB function on a worker thread with that thread's connection,
+# so blocking SQLite calls don't stall the event loop
+async def run_db(func, *args):
+  return await to_thread.run_sync(lambda: func(get_db(), *args))
+
+
+# Run a single query on a worker thread and return the rows as dictionaries
+async def run_query(query: str, params=()) -> list:
+  return await run_db(fetch_rows, query, params)
+
+
+# Fetch outlets in a location (matched anywhere in the address) that offer any of the categories.
+# The categories are passed as a single JSON array so the SQL text never changes
+# and sqlite3's statement cache can reuse the prepared query
+def query_outlets_by_category_and_location(conn: sqlite3.Connection, categories, location: str) -> list:
+  return fetch_rows(conn, """
+    SELECT o.* FROM outlets o
+    JOIN categories c ON o.id = c.outlet_id
+    WHERE o.id IN (SELECT rowid FROM outlets_fts WHERE address LIKE ?)
+      AND c.category COLLATE NOCASE IN (SELECT value FROM json_each(?))
+  """, (f"%{location}%", json.dumps(sorted(categories))))
+
+
+# Fetch outlets that offer any of the categories (case-insensitive via NOCASE collation)
+def query_outlets_by_category(conn: sqlite3.Connection, categories) -> list:
+  return fetch_rows(conn, """
+    SELECT DISTINCT o.* FROM outlets o
+    JOIN categories c ON o.id = c.outlet_id
+    WHERE c.category COLLATE NOCASE IN (SELECT value FROM json_each(?))
+    ORDER BY o.id
+  """, (json.dumps(sorted(categories)),))
+
+
+# Fetch outlets whose address contains the location, using the trigram index
+def query_outlets_by_location(conn: sqlite3.Connection, location: str) -> list:
+  return fetch_rows(conn, """
+    SELECT * FROM outlets
+    WHERE id IN (SELECT rowid FROM outlets_fts WHERE address LIKE ?)
+    ORDER BY id
+  """, (f"%{location}%",))
+
+
+# The database is read-only, so the /outlets and /outlets/{id}/services payloads are
+# serialized once, on first use, and served from memory afterwards
+_payload_cache = {}
+
+
+# Query and serialize every cached payload in one pass over the database
+def build_payload_cache(conn: sqlite3.Connection) -> dict:
+  # Execute a query to select all records from the 'outlets' table
+  outlets = fetch_rows(conn, "SELECT * FROM outlets")
+
+  # Group each outlet's services (categories), keeping their stored order
+  services = {}
+  for outlet_id, category in conn.execute("SELECT outlet_id, category FROM categories ORDER BY outlet_id, id"):
+    services.setdefault(outlet_id, []).append(category)
+
+  return {
+    "outlets": orjson.dumps({"outlets": outlets}),
+    "services": {
+      outlet_id: orjson.dumps({"outlet_id": outlet_id, "services": categories})
+      for outlet_id, categories in services.items()
+    },
+  }
+
+
+# Return the cached payloads, building them on the first call
+async def get_payload_cache() -> dict:
+  if not _payload_cache:
+    _payload_cache.update(await run_db(build_payload_cache))
+  return _payload_cache
+
+
 # Define a route to fetch outlets from the database
 # Returns a list of all outlets as a JSON response
 @app.get("/outlets")
-def get_outlets() -> dict:
-  # Connect to the SQLite database
-  with sqlite3.connect(db_dir) as conn:
-    conn.row_factory = sqlite3.Row  # This allows fetching rows as dictionaries
-    cursor = conn.cursor()
-    # Execute a query to select all records from the 'outlets' table
-    cursor.execute("SELECT * FROM outlets")
-    # Fetch all the results from the query
-    outlets = [dict(row) for row in cursor.fetchall()]  # Convert rows to dictionaries
-  # Return the fetched outlets as a JSON response
-  return {"outlets": outlets}
+async def get_outlets() -> Response:
+  # Return the pre-serialized outlets as a JSON response
+  cache = await get_payload_cache()
+  return Response(content=cache["outlets"], media_type="application/json")
 
 # Define a route to fetch outlets based on a search query
 # The search is case-insensitive and matches any part of the outlet name
 # Returns a list of outlets that match the search query
 @app.get("/outlets/search")
-def search_outlets(query: str) -> dict:
-  # Connect to the SQLite database
-  with sqlite3.connect(db_dir) as conn:
-    conn.row_factory = sqlite3.Row  # This allows fetching rows as dictionaries
-    cursor = conn.cursor()
-    # Execute a query to search for outlets where the name matches the query (case-insensitive)
-    cursor.execute("""
-      SELECT * FROM outlets WHERE LOWER(name) LIKE LOWER(?)
-    """, (f"%{query.lower()}%",))
-    # Fetch all the results from the query
-    outlets = [dict(row) for row in cursor.fetchall()]  # Convert rows to dictionaries
+async def search_outlets(query: str) -> dict:
+  # Execute a query to search for outlets where the name matches the query
+  # The trigram index answers case-insensitive LIKE '%x%' without scanning every name
+  outlets = await run_query("""
+    SELECT * FROM outlets
+    WHERE id IN (SELECT rowid FROM outlets_fts WHERE name LIKE ?)
+    ORDER BY id
+  """, (f"%{query}%",))
   # Return the fetched outlets as a JSON response
   return {"outlets": outlets}
 
 @app.get("/outlets/category/location")
-def get_outlet_by_category_and_location(categories: str, location: str) -> dict:
+async def get_outlet_by_category_and_location(categories: str, location: str) -> dict:
     """Fetch outlets that match BOTH category and location criteria."""
-    with sqlite3.connect(db_dir) as conn:
-        conn.row_factory = sqlite3.Row  
-        cursor = conn.cursor()
-
-        # Split the category string back into a list
-        category_list = categories.split(",")
-
-        # Base SQL query
-        query = """
-            SELECT o.* FROM outlets o
-            JOIN categories c ON o.id = c.outlet_id
-            WHERE LOWER(o.address) LIKE LOWER(?)
-        """
+    # Split the category string back into a list
+    category_list = categories.split(",")
 
-        # Dynamically add category filters using `IN` for efficiency
-        if category_list:
-            placeholders = ", ".join(["?"] * len(category_list))  # Creates (?, ?, ?)
-            query += f" AND LOWER(c.category) IN ({placeholders})"
-
-        # Execute the query with parameters
-        params = [f"%{location.lower()}%"] + [cat.lower() for cat in category_list]
-        cursor.execute(query, params)
-
-        # Convert results into dictionaries
-        outlets = [dict(row) for row in cursor.fetchall()]
+    outlets = await run_db(query_outlets_by_category_and_location, category_list, location)
 
     return {"outlets": outlets}
 
 
 @app.get("/outlets/location/{location}")
-def get_outlets_by_location(location: str) -> dict:
-    # Connect to the SQLite database
-    with sqlite3.connect(db_dir) as conn:
-        conn.row_factory = sqlite3.Row  # Allows fetching rows as dictionaries
-        cursor = conn.cursor()
-
-        # Query to search for the location within the address field
-        cursor.execute("""
-            SELECT * FROM outlets WHERE LOWER(address) LIKE ?
-        """, (f"%{location.lower()}%",))
-
-        # Fetch results and convert rows to dictionaries
-        outlets = [dict(row) for row in cursor.fetchall()]
+async def get_outlets_by_location(location: str) -> dict:
+    # Query to search for the location within the address field
+    outlets = await run_db(query_outlets_by_location, location)
 
     # Return fetched outlets
     return {"outlets": outlets} if outlets else {"message": "No outlets found in this location."}
 
 
+# Build WHERE conditions for a lat/lng bounding box that contains every point within radius_km
+# of (lat, lng), so the (lat, lng) index can discard far-away outlets before any trig is evaluated
+# Returns the list of SQL conditions and their parameters
+def nearby_bounding_box(lat: float, lng: float, radius_km: float) -> tuple:
+  if not math.isfinite(radius_km):
+    return [], []  # An unbounded (or NaN) radius can't be boxed
+
+  angular_radius = radius_km / 6371
+  lat_rad = math.radians(lat)
+  dlat = math.degrees(angular_radius)
+  conditions = ["lat BETWEEN ? AND ?"]
+  params = [lat - dlat, lat + dlat]
+
+  # The longitude half-width asin(sin(r) / cos(lat)) only holds for radii under a quarter
+  # of the globe that don't reach a pole; otherwise every longitude is in range
+  ratio = math.sin(angular_radius) / max(math.cos(lat_rad), 1e-12)
+  if angular_radius < math.pi / 2 and ratio < 1:
+    dlng = math.degrees(math.asin(ratio))
+    lng_min, lng_max = lng - dlng, lng + dlng
+    if lng_min < -180:
+      # The window wraps past the antimeridian, so split it into two ranges
+      conditions.append("(lng BETWEEN ? AND 180 OR lng BETWEEN -180 AND ?)")
+      params += [lng_min + 360, lng_max]
+    elif lng_max > 180:
+      conditions.append("(lng BETWEEN ? AND 180 OR lng BETWEEN -180 AND ?)")
+      params += [lng_min, lng_max - 360]
+    else:
+      conditions.append("lng BETWEEN ? AND ?")
+      params += [lng_min, lng_max]
+
+  return conditions, params
+
+
 # Define a route to fetch nearby outlets based on latitude, longitude, and radius
 # The haversine formula is used to calculate the distance between two points on the Earth's surface
 # Default radius is set to 5 km
 # Returns a list of outlets within the specified radius
 @app.get("/outlets/nearby")
-def get_nearby_outlets(lat: float, lng: float, radius_km: float = 5) -> dict:
-  # Connect to the SQLite database
-  with sqlite3.connect(db_dir) as conn:
-    conn.row_factory = sqlite3.Row  # This allows fetching rows as dictionaries
-    cursor = conn.cursor()
-    # Execute a query to calculate the distance of outlets from the given coordinates
-    # and filter outlets within the specified radius (in kilometers)
-    cursor.execute("""
-      SELECT *, 
-      (6371 * acos(
-        cos(radians(?)) * cos(radians(lat)) * 
-        cos(radians(lng) - radians(?)) + 
-        sin(radians(?)) * sin(radians(lat))
-      )) AS distance
-      FROM outlets
-      WHERE distance <= ?
-      ORDER BY distance ASC
-    """, (lat, lng, lat, radius_km))
-    # Fetch all the results from the query
-    outlets = [dict(row) for row in cursor.fetchall()]  # Convert rows to dictionaries
+async def get_nearby_outlets(lat: float, lng: float, radius_km: float = 5) -> dict:
+  # Non-finite coordinates can't be near any outlet
+  if not (math.isfinite(lat) and math.isfinite(lng)):
+    return {"outlets": []}
+
+  lat_rad = math.radians(lat)
+  conditions, box_params = nearby_bounding_box(lat, lng, radius_km)
+  where = " AND ".join(conditions + ["distance <= ?"])
+
+  # Execute a query to calculate the distance of outlets from the given coordinates
+  # and filter outlets within the specified radius (in kilometers)
+  # The query point's sin/cos are computed once here rather than per row
+  outlets = await run_query(f"""
+    SELECT *,
+    (6371 * acos(
+      ? * cos(radians(lat)) *
+      cos(radians(lng) - ?) +
+      ? * sin(radians(lat))
+    )) AS distance
+    FROM outlets
+    WHERE {where}
+    ORDER BY distance ASC
+  """, (math.cos(lat_rad), math.radians(lng), math.sin(lat_rad), *box_params, radius_km))
   # Return the fetched outlets as a JSON response
   return {"outlets": outlets}
 
@@ -149,15 +251,11 @@ def get_nearby_outlets(lat: float, lng: float, radius_km: float = 5) -> dict:
 # The ID is expected to be an integer
 # Returns the outlet details as a dictionary
 @app.get("/outlets/{outlet_id}")
-def get_outlet(outlet_id: int) -> dict:
-  # Connect to the SQLite database
-  with sqlite3.connect(db_dir) as conn:
-    conn.row_factory = sqlite3.Row  # This allows fetching rows as dictionaries
-    cursor = conn.cursor()
-    # Execute a query to select a specific outlet by its ID
-    cursor.execute("SELECT * FROM outlets WHERE id = ?", (outlet_id,))
-    # Fetch the result from the query
-    outlet = cursor.fetchone()
+async def get_outlet(outlet_id: int) -> dict:
+  # Execute a query to select a specific outlet by its ID
+  rows = await run_query("SELECT * FROM outlets WHERE id = ?", (outlet_id,))
+  # Fetch the result from the query
+  outlet = rows[0] if rows else None
   # Return the fetched outlet as a JSON response
   return {"outlet": outlet}
 
@@ -165,27 +263,13 @@ def get_outlet(outlet_id: int) -> dict:
 # The category is case-insensitive
 # Returns a list of outlets as dictionary that belong to the specified category
 @app.get("/outlets/category/{category}")
-def get_outlets_by_category(categories: list) -> dict:
+async def get_outlets_by_category(categories: list) -> dict:
     """Fetch outlets that match multiple categories."""
     if not categories:
         return {"outlets": []}  # Return empty if no categories are provided
 
-    with sqlite3.connect(db_dir) as conn:
-        conn.row_factory = sqlite3.Row  
-        cursor = conn.cursor()
-
-        # Prepare dynamic placeholders for categories
-        placeholders = ", ".join(["?" for _ in categories])
-
-        # SQL query to find outlets that match any of the given categories
-        query = f"""
-            SELECT DISTINCT o.* FROM outlets o
-            JOIN categories c ON o.id = c.outlet_id
-            WHERE LOWER(c.category) IN ({placeholders})
-        """
-
-        cursor.execute(query, [category.lower() for category in categories])  # Convert to lowercase for case-insensitive matching
-        outlets = [dict(row) for row in cursor.fetchall()]
+    # Find outlets that match any of the given categories
+    outlets = await run_db(query_outlets_by_category, categories)
 
     return {"outlets": outlets}
 
@@ -193,47 +277,46 @@ def get_outlets_by_category(categories: list) -> dict:
 # Define a route to fetch the services offered by a specific outlet
 # Returns a list of services (categories) associated with the outlet ID
 @app.get("/outlets/{outlet_id}/services")
-def get_outlet_services(outlet_id: int) -> dict:
-  # Connect to the SQLite database
-  with sqlite3.connect(db_dir) as conn:
-    cursor = conn.cursor()
-    # Execute a query to select all categories (services) for the given outlet ID
-    cursor.execute("""
-      SELECT category FROM categories WHERE outlet_id = ?
-    """, (outlet_id,))
-    # Extract the services from the query results
-    services = [row[0] for row in cursor.fetchall()]
+async def get_outlet_services(outlet_id: int) -> Response:
+  # Look up the pre-serialized services for the given outlet ID
+  cache = await get_payload_cache()
+  content = cache["services"].get(outlet_id)
+  if content is None:
+    # Outlets without any services (or unknown IDs) get an empty list
+    content = orjson.dumps({"outlet_id": outlet_id, "services": []})
   # Return the outlet ID and its services as a JSON response
-  return {"outlet_id": outlet_id, "services": services}
+  return Response(content=content, media_type="application/json")
 
 # Define a route to fetch information relating to the user's query.
 # Currently using rule-based. Need to implement a more advanced NLP model for better understanding of queries
 @app.get("/chatbot/query")
-def chatbot_query(query: str) -> dict:
+async def chatbot_query(query: str) -> dict:
     """Handles user queries using fuzzy matching and NLP."""
-    query = query.lower()  # Normalize query
+    # The fuzzy matching is CPU-bound, so it runs on the worker thread along with the DB query
+    return await run_db(answer_chatbot_query, query)
 
-    query = preprocess_query(query)  # Preprocess the query
+# Extract categories & location from the query and look up the matching outlets
+# Runs on a worker thread with that thread's connection
+def answer_chatbot_query(conn: sqlite3.Connection, query: str) -> dict:
+    query = preprocess_query(query)  # Normalize (lowercase) and preprocess the query in one pass
     print(f"Preprocessed Query: {query}")
 
     # Extract categories & location from query
     categories = extract_category(query)  # Returns a set of categories
     location = extract_location(query)  # Extracts location (can be None)
 
-    # Get all matching outlets
+    # Get all matching outlets with a single query
     if categories and location:
         print('Both categories and location provided')
-        category_string = ",".join(categories)  # Convert set to comma-separated string
-        outlets = get_outlet_by_category_and_location(category_string, 
-        location)
+        outlets = query_outlets_by_category_and_location(conn, categories, location)
         return process_outlets_to_message(outlets)
     elif categories:
         print('Only categories provided')
-        outlets = get_outlets_by_category(list(categories))
+        outlets = query_outlets_by_category(conn, categories)
         return process_outlets_to_message(outlets)
     elif location:
         print('Only location provided')
-        outlets = get_outlets_by_location(location)
+        outlets = query_outlets_by_location(conn, location)
         return process_outlets_to_message(outlets)
 
     return {
@@ -247,17 +330,12 @@ def chatbot_query(query: str) -> dict:
 
 # Define a function to process the outlets and format them into a message
 # This function is called when the chatbot query returns results
-def process_outlets_to_message(outlets: dict) -> dict:
-    outlet_list = outlets.get("outlets", [])  # Extract the list of outlets safely
-
+def process_outlets_to_message(outlet_list: list) -> dict:
     if not outlet_list:
         return {"message": "No outlets found for your request."}
 
-    message = "Here are the outlets I found:\n\n"
-    for outlet in outlet_list:
-        name = outlet['name'].strip()  # Remove spaces before/after the name
-        address = outlet['address'].strip()  # Remove spaces before/after the address
-        message += f"{name}\n{address}\n\n"  # Name on top, address below
+    # Name on top, address below (spaces before/after each removed), joined in a single pass
+    body = "".join(f"{outlet['name'].strip()}\n{outlet['address'].strip()}\n\n" for outlet in outlet_list)
 
-    message += "If you need more information, please let me know!"
+    message = f"Here are the outlets I found:\n\n{body}If you need more information, please let me know!"
     return {"message": message}
\ No newline at end of file
@@ -0,0 +1,66 @@
+import asyncio
+import math
+import sqlite3
+import unittest
+
+from main import get_nearby_outlets, nearby_bounding_box
+
+
+HAVERSINE = """
+  (6371 * acos(
+    cos(radians(:lat)) * cos(radians(lat)) *
+    cos(radians(lng) - radians(:lng)) +
+    sin(radians(:lat)) * sin(radians(lat))
+  ))
+"""
+
+
+class NearbyBoundingBoxTest(unittest.TestCase):
+  """The bounding box must never drop an outlet the plain haversine filter keeps."""
+
+  @classmethod
+  def setUpClass(cls):
+    # A global 1.5-degree grid of points, plus a dense strip on both sides of the antimeridian
+    cls.conn = sqlite3.connect(":memory:")
+    cls.conn.execute("CREATE TABLE outlets (id INTEGER PRIMARY KEY, lat REAL, lng REAL)")
+    points = [(lat / 2, lng / 2) for lat in range(-180, 181, 3) for lng in range(-360, 360, 3)]
+    points += [(lat / 10, lng / 100) for lat in range(-20, 21) for lng in [*range(-18000, -17900), *range(17900, 18001)]]
+    cls.conn.executemany("INSERT INTO outlets (lat, lng) VALUES (?, ?)", points)
+
+  def assert_box_keeps_all(self, lat, lng, radius_km):
+    expected = self.conn.execute(
+      f"SELECT id FROM outlets WHERE {HAVERSINE} <= :radius ORDER BY id",
+      {"lat": lat, "lng": lng, "radius": radius_km},
+    ).fetchall()
+    conditions, params = nearby_bounding_box(lat, lng, radius_km)
+    where = " AND ".join(conditions + [f"{HAVERSINE.replace(':lat', str(lat)).replace(':lng', str(lng))} <= ?"])
+    actual = self.conn.execute(f"SELECT id FROM outlets WHERE {where} ORDER BY id", (*params, radius_km)).fetchall()
+    self.assertEqual(actual, expected, f"lat={lat} lng={lng} radius_km={radius_km}")
+
+  def test_regular_radius(self):
+    self.assert_box_keeps_all(3.14, 101.69, 5)
+    self.assert_box_keeps_all(3.14, 101.69, 500)
+
+  def test_antimeridian_split(self):
+    for lng in (179.9, -179.9, 180, -180):
+      with self.subTest(lng=lng):
+        conditions, _ = nearby_bounding_box(1.0, lng, 50)
+        self.assertIn("(lng BETWEEN ? AND 180 OR lng BETWEEN -180 AND ?)", conditions)
+        self.assert_box_keeps_all(1.0, lng, 50)
+
+  def test_pole_and_large_radius_drop_the_lng_bound(self):
+    for lat, lng, radius_km in ((89.5, 10, 100), (-89.9, -45, 50), (3.14, 101.69, 10008), (3.14, 101.69, 20000)):
+      with self.subTest(lat=lat, lng=lng, radius_km=radius_km):
+        conditions, _ = nearby_bounding_box(lat, lng, radius_km)
+        self.assertEqual(conditions, ["lat BETWEEN ? AND ?"])
+        self.assert_box_keeps_all(lat, lng, radius_km)
+
+  def test_non_finite_inputs(self):
+    self.assertEqual(nearby_bounding_box(3.14, 101.69, math.inf), ([], []))
+    self.assertEqual(nearby_bounding_box(3.14, 101.69, math.nan), ([], []))
+    self.assertEqual(asyncio.run(get_nearby_outlets(math.inf, 101.69)), {"outlets": []})
+    self.assertEqual(asyncio.run(get_nearby_outlets(3.14, -math.inf)), {"outlets": []})
+
+
+if __name__ == "__main__":
+  unittest.main()